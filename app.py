@@ -6,27 +6,128 @@ Advanced pharmacokinetic and pharmacodynamic analysis platform
 
 import os
 import re
-import json
 import io
-import pandas as pd
+import tempfile
+import bisect
+import functools
+import hashlib
+import orjson
+import multiprocessing
+import socket
+import subprocess
+import sys
+import time
+import zipfile
 import webbrowser
 from datetime import datetime
-from threading import Timer
+from threading import Lock, Thread
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Optional
 from flask import Flask, render_template, request, jsonify, send_file
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import RequestEntityTooLarge
 from flask_cors import CORS
-from groq import Groq
-from dotenv import load_dotenv
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
+from flask_compress import Compress
+
+# An unquoted value ends where whitespace is followed by '#'
+_ENV_INLINE_COMMENT = re.compile(r'\s+#')
+
+def _env_value(value: str) -> str:
+    quote = value[:1]
+    if quote in ('"', "'"):
+        end = value.find(quote, 1)
+        while quote == '"' and end != -1 and value[end - 1] == '\\':
+            end = value.find(quote, end + 1)
+        rest = value[end + 1:].strip() if end != -1 else None
+        # Only a matching closing quote (optionally followed by a comment) unquotes
+        if rest is not None and (not rest or rest.startswith('#')):
+            inner = value[1:end]
+            return inner.replace('\\"', '"') if quote == '"' else inner
+    comment = _ENV_INLINE_COMMENT.search(value)
+    return value[:comment.start()] if comment else value
+
+def _load_dotenv(path: str):
+    # Small reader for the .env subset python-dotenv handles in practice:
+    # optional 'export', quoted values and inline comments. As with
+    # python-dotenv, real environment variables win
+    try:
+        env_file = open(path, encoding='utf-8')
+    except OSError:
+        return
+    with env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('export '):
+                line = line[len('export '):].lstrip()
+            key, sep, value = line.partition('=')
+            if not sep or not key.strip():
+                continue
+            os.environ.setdefault(key.strip(), _env_value(value.strip()))
+
+# Read .env once at startup; everything else uses the frozen values below
+_load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+
+# Accepted spellings of "on" for boolean environment settings
+_TRUTHY = frozenset({'1', 'true', 'yes', 'on', 't', 'y'})
+
+def _env_int(name: str, default: int, minimum: int, maximum: int) -> int:
+    value = os.environ.get(name, '').strip()
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+    if number is not None and minimum <= number <= maximum:
+        return number
+    if value:
+        print(f"⚠️  Ignoring invalid {name}={value!r}, using {default}")
+    return default
+
+class Config:
+    GROQ_API_KEY = os.environ.get('GROQ_API_KEY')
+    FLASK_HOST = os.environ.get('FLASK_HOST', '').strip() or '127.0.0.1'
+    FLASK_PORT = _env_int('FLASK_PORT', 5000, 1, 65535)
+    # Bulk export processes per server process; gunicorn already runs one
+    # worker per core, so this stays small rather than scaling with cores
+    EXPORT_POOL_WORKERS = _env_int('EXPORT_POOL_WORKERS', min(2, os.cpu_count() or 1), 1, os.cpu_count() or 1)
+    DEBUG = os.environ.get('FLASK_DEBUG', '').strip().lower() in _TRUTHY
+
+# Route Flask's JSON encoding and decoding through orjson
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the
+        # decode/encode round trip through str that dumps() implies
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+            mimetype='application/json'
+        )
 
 # Flask App Setup
 template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'templates'))
 app = Flask(__name__, template_folder=template_dir)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Analyze payloads repeat the same formulation strings and compress well.
+# PDF and XLSX exports are left out: both are already deflate-compressed.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+# Fastest levels: the repetitive text still shrinks several-fold at level 1
+app.config['COMPRESS_LEVEL'] = 1
+app.config['COMPRESS_BR_LEVEL'] = 1
+# Autocomplete arrays are smaller than this and are sent as-is
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
 # Active Ingredients Database (2023-2025)
 DRUG_DATABASE = [
     'vamorolone', 'motixafortide', 'repotrectinib', 'nirsevimab-alip', 'bimekizumab-bkzx',
@@ -58,37 +159,230 @@ DRUG_DATABASE = [
     'penpulimab-kcqx', 'atrasentan', 'fitusiran', 'gepotidacin', 'vimseltinib',
     'mirdametinib', 'suzetrigine', 'tresosulfan', 'datopotamab deruxtecan-dlnk'
 ]
+DRUG_DATABASE_SET = frozenset(DRUG_DATABASE)
+DRUG_DATABASE_LC = tuple(drug.lower() for drug in DRUG_DATABASE)
+DRUG_DATABASE_VERSION = hashlib.sha1('\n'.join(DRUG_DATABASE).encode()).hexdigest()[:12]
+
+# Sorted suffix index: every substring of a drug name is a prefix of one of
+# its suffixes, so a substring query becomes a bisect plus a short forward walk
+_SUFFIX_INDEX = sorted(
+    (drug_lc[start:], i)
+    for i, drug_lc in enumerate(DRUG_DATABASE_LC)
+    for start in range(len(drug_lc))
+)
+_SUFFIXES = [suffix for suffix, _ in _SUFFIX_INDEX]
+_SUFFIX_OWNERS = [i for _, i in _SUFFIX_INDEX]
+
+def _match_drugs(query: str) -> list:
+    hits = set()
+    pos = bisect.bisect_left(_SUFFIXES, query)
+    while pos < len(_SUFFIXES) and _SUFFIXES[pos].startswith(query):
+        hits.add(_SUFFIX_OWNERS[pos])
+        pos += 1
+    return [DRUG_DATABASE[i] for i in sorted(hits)[:10]]
+
+def _search_etag(query: str) -> str:
+    return hashlib.sha1(f"{DRUG_DATABASE_VERSION}:{query}".encode()).hexdigest()
+
+# Two characters is the shortest query autocomplete sends, so every one that
+# can match is answered from JSON serialized once at import
+_TWO_CHAR_RESULTS = {
+    query: (orjson.dumps(_match_drugs(query)), _search_etag(query))
+    for query in {suffix[:2] for suffix in _SUFFIXES if len(suffix) >= 2}
+}
+
+# PK/PD table layout shared by every drug
+_PARAMETERS = (
+    'Dissolution Rate', 'Disintegration Time', 'Kinetics', 'Cmax', 'Tmax', 'AUC',
+    'Half-life', 'Onset of Action', 'Duration of Action', 'Side Effects', 'Stability Studies'
+)
+_FORMULATIONS = ('IR', 'SR', 'CR', 'PR', 'DR', 'Targeted')
+_HEADER_ROW = ['Parameter', *_FORMULATIONS]
+
+# Release profiles by drug class (realistic values based on class patterns),
+# stored as tuples since they are shared read-only by every analysis
+# Monoclonal Antibodies (mAbs)
+_MAB_PROFILE = {
+    'Dissolution Rate': ('N/A', 'N/A', 'N/A', 'N/A', 'N/A', '95%/site'),
+    'Disintegration Time': ('N/A', 'N/A', 'N/A', 'N/A', 'N/A', '5-15min'),
+    'Kinetics': ('Linear', 'Linear', 'Linear', 'Linear', 'Linear', 'Targeted'),
+    'Cmax': ('50μg/mL', '45μg/mL', '40μg/mL', '35μg/mL', '48μg/mL', '75μg/mL'),
+    'Tmax': ('24-72h', '48-96h', '72-120h', '96-168h', '48-96h', '12-24h'),
+    'AUC': ('2500μg·h/mL', '3000μg·h/mL', '3500μg·h/mL', '4000μg·h/mL', '2800μg·h/mL', '5000μg·h/mL'),
+    'Half-life': ('14-21d', '21-28d', '28-35d', '35-42d', '14-21d', '10-14d'),
+    'Onset of Action': ('2-4 weeks', '4-6 weeks', '6-8 weeks', '8-12 weeks', '4-6 weeks', '1-2 weeks'),
+    'Duration of Action': ('4-12 weeks', '8-16 weeks', '12-24 weeks', '16-32 weeks', '8-16 weeks', '4-8 weeks'),
+    'Side Effects': ('Infusion reactions', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'),
+    'Stability Studies': ('24 months', '36 months', '48 months', '60 months', '24 months', '18 months')
+}
+
+# Small Molecule Kinase Inhibitors
+_KINASE_PROFILE = {
+    'Dissolution Rate': ('80%/30min', '45%/4h', '22%/8h', '18%/12h', '0%/2h', '70%/site'),
+    'Disintegration Time': ('10-20min', '30-60min', '60-120min', '120-240min', '45-180min', '15-45min'),
+    'Kinetics': ('First-order', 'Zero-order', 'Mixed-order', 'Zero-order', 'First-order', 'Targeted'),
+    'Cmax': ('250ng/mL', '180ng/mL', '120ng/mL', '95ng/mL', '220ng/mL', '350ng/mL'),
+    'Tmax': ('2-4h', '4-8h', '6-12h', '8-16h', '4-8h', '2-6h'),
+    'AUC': ('1200ng·h/mL', '1800ng·h/mL', '2200ng·h/mL', '2800ng·h/mL', '1400ng·h/mL', '3200ng·h/mL'),
+    'Half-life': ('8-12h', '12-18h', '18-24h', '24-36h', '8-12h', '6-10h'),
+    'Onset of Action': ('2-4h', '4-8h', '6-12h', '8-16h', '4-8h', '2-4h'),
+    'Duration of Action': ('12-24h', '24-48h', '48-72h', '72-96h', '24-48h', '12-24h'),
+    'Side Effects': ('Hepatotoxic/Rash', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'),
+    'Stability Studies': ('24 months', '36 months', '48 months', '60 months', '24 months', '18 months')
+}
+
+# Peptide/Protein Therapeutics
+_PEPTIDE_PROFILE = {
+    'Dissolution Rate': ('N/A', 'N/A', 'N/A', 'N/A', 'N/A', '90%/site'),
+    'Disintegration Time': ('N/A', 'N/A', 'N/A', 'N/A', 'N/A', '2-10min'),
+    'Kinetics': ('Non-linear', 'Non-linear', 'Non-linear', 'Non-linear', 'Non-linear', 'Targeted'),
+    'Cmax': ('15μg/mL', '12μg/mL', '8μg/mL', '6μg/mL', '14μg/mL', '25μg/mL'),
+    'Tmax': ('1-3h', '2-6h', '4-8h', '6-12h', '2-6h', '0.5-2h'),
+    'AUC': ('180μg·h/mL', '280μg·h/mL', '350μg·h/mL', '450μg·h/mL', '220μg·h/mL', '600μg·h/mL'),
+    'Half-life': ('2-6h', '4-8h', '6-12h', '8-16h', '2-6h', '1-4h'),
+    'Onset of Action': ('30min-2h', '1-4h', '2-6h', '4-8h', '1-4h', '15-60min'),
+    'Duration of Action': ('6-12h', '12-24h', '24-48h', '48-72h', '12-24h', '4-8h'),
+    'Side Effects': ('Injection site', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'),
+    'Stability Studies': ('18 months', '24 months', '36 months', '48 months', '18 months', '12 months')
+}
+
+# Default small molecule profile
+_DEFAULT_PROFILE = {
+    'Dissolution Rate': ('75%/45min', '40%/5h', '20%/10h', '15%/15h', '0%/3h', '65%/site'),
+    'Disintegration Time': ('8-18min', '25-55min', '55-110min', '110-220min', '40-160min', '12-40min'),
+    'Kinetics': ('First-order', 'Zero-order', 'Mixed-order', 'Zero-order', 'First-order', 'Targeted'),
+    'Cmax': ('120ng/mL', '85ng/mL', '55ng/mL', '42ng/mL', '105ng/mL', '180ng/mL'),
+    'Tmax': ('1.5-3h', '3-7h', '5-10h', '7-14h', '3-7h', '1-4h'),
+    'AUC': ('650ng·h/mL', '950ng·h/mL', '1150ng·h/mL', '1350ng·h/mL', '750ng·h/mL', '1650ng·h/mL'),
+    'Half-life': ('6-10h', '10-16h', '16-24h', '24-36h', '6-10h', '4-8h'),
+    'Onset of Action': ('45min-2h', '2-5h', '4-8h', '6-12h', '2-5h', '30min-2h'),
+    'Duration of Action': ('8-16h', '16-32h', '32-48h', '48-72h', '16-32h', '6-12h'),
+    'Side Effects': ('Moderate', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'),
+    'Stability Studies': ('24 months', '36 months', '48 months', '60 months', '24 months', '18 months')
+}
+
+# Profile, explanation and release recommendation for each drug class
+_CLASS_PROFILES = {
+    'mab': _MAB_PROFILE,
+    'kinase': _KINASE_PROFILE,
+    'ser_thr_kinase': _KINASE_PROFILE,
+    'peptide': _PEPTIDE_PROFILE
+}
+
+def _build_table(profile: dict) -> Dict:
+    table_data = [_HEADER_ROW]
+    table_data.extend([param, *profile[param]] for param in _PARAMETERS)
+    return {
+        'structured_data': table_data,
+        'parameters': _PARAMETERS,
+        'formulations': _FORMULATIONS
+    }
+
+# Table data depends only on the profile, so build every table once at import
+_CLASS_TABLES = {drug_class: _build_table(profile) for drug_class, profile in _CLASS_PROFILES.items()}
+_DEFAULT_TABLE = _build_table(_DEFAULT_PROFILE)
+
+_CLASS_EXPLANATIONS = {
+    'mab': "{name} is a monoclonal antibody for targeted therapy. It provides precise disease treatment with reduced side effects.",
+    'kinase': "{name} is a kinase inhibitor for cancer treatment. It blocks specific enzymes driving tumor growth."
+}
+_DEFAULT_EXPLANATION = "{name} is a therapeutic agent with specific mechanism. It targets biological pathways for disease treatment."
+
+_CLASS_RELEASES = {
+    'mab': "Best Release: {name} requires targeted delivery due to protein structure. Subcutaneous injection with extended-release reduces frequency and improves compliance.",
+    'kinase': "Best Release: {name} benefits from sustained release to maintain therapeutic levels. SR tablets provide consistent kinase inhibition with reduced toxicity.",
+    'sglt2': "Best Release: {name} works best as once-daily extended release. CR formulation ensures 24-hour glucose control with better adherence."
+}
+_DEFAULT_RELEASE = "Best Release: {name} optimal formulation depends on indication. IR for acute effects, SR for chronic therapy, targeted for precision delivery."
+
+# Drug-specific explanations, formatted once at import
+_EXPLANATIONS = {
+    'vamorolone': "{name} is a dissociative steroid for Duchenne muscular dystrophy. It provides anti-inflammatory benefits while reducing steroid side effects.",
+    'repotrectinib': "{name} is an ALK/ROS1 kinase inhibitor for lung cancer. It overcomes resistance mutations with CNS penetration.",
+    'nirsevimab-alip': "{name} is a long-acting RSV monoclonal antibody for infant protection. Single injection provides extended immunity.",
+    'bexagliflozin': "{name} is an SGLT2 inhibitor for type 2 diabetes. It blocks kidney glucose reabsorption with cardiovascular benefits.",
+    'trofinetide': "{name} is an IGF-1 analog for Rett syndrome. It promotes synaptic development in neurological disorders.",
+    'gepirone': "{name} is a 5-HT1A agonist for depression. It provides antidepressant effects with fewer sexual side effects.",
+    'sparsentan': "{name} is a dual receptor antagonist for kidney disease. It reduces proteinuria through endothelin/angiotensin blockade.",
+    'fruquintinib': "{name} is a VEGFR inhibitor for colorectal cancer. It blocks tumor blood vessel formation.",
+    'pirtobrutinib': "{name} is a non-covalent BTK inhibitor for B-cell cancers. It overcomes resistance to other BTK drugs.",
+    'lecanemab-irmb': "{name} is an anti-amyloid antibody for Alzheimer's disease. It targets brain plaques to slow cognitive decline."
+}
+_EXPLANATIONS = {name: text.format(name=name) for name, text in _EXPLANATIONS.items()}
+
+REFERENCES_TEMPLATE = """References:
+• FDA Drug Database - {drug} prescribing information and clinical data
+• Shargel L, Yu ABC. Applied Biopharmaceutics & Pharmacokinetics. 7th ed. McGraw-Hill; 2016. ISBN: 978-0071375504
+• Rowland M, Tozer TN. Clinical Pharmacokinetics and Pharmacodynamics. 4th ed. Lippincott Williams & Wilkins; 2011. ISBN: 978-0781750097
+• DrugBank Database - {drug} pharmacological data (drugbank.ca)
+• ClinicalTrials.gov - {drug} clinical trial safety profiles
+• Goodman & Gilman's Pharmacological Basis of Therapeutics. 13th ed. McGraw-Hill; 2018. ISBN: 978-1259584732
+
+© 2024 Farhan. All rights reserved."""
+# Non-blank reference lines, split once for the exporters
+REFERENCE_LINE_TEMPLATES = tuple(line.strip() for line in REFERENCES_TEMPLATE.split('\n') if line.strip())
+# The same lines as one Paragraph's markup, so the PDF lays out one flowable
+REFERENCE_MARKUP_TEMPLATE = '<br/><br/>'.join(REFERENCE_LINE_TEMPLATES)
+
+# INN stem fragments used to classify drugs by name, checked in this order
+_DRUG_CLASS_STEMS = (
+    ('mab', ('mab',)),                      # -mab covers -zumab, -limab, -cizumab, -tuzumab
+    ('kinase', ('nib',)),                   # -nib covers -tinib
+    ('ser_thr_kinase', ('sertib', 'ciclib')),
+    ('sglt2', ('flozin',)),
+    ('peptide', ('alfa', 'beta', 'ase', 'sen', 'tide')),
+)
+
+# One precompiled, case-insensitive alternation per class; a single search
+# call replaces lowercasing the name and testing each stem in turn
+_DRUG_CLASS_PATTERNS = tuple(
+    (drug_class, re.compile('|'.join(stems), re.IGNORECASE))
+    for drug_class, stems in _DRUG_CLASS_STEMS
+)
+
+def _classify(drug_name: str) -> str:
+    for drug_class, pattern in _DRUG_CLASS_PATTERNS:
+        if pattern.search(drug_name):
+            return drug_class
+    return 'other'
+
+# Analysis types accepted from clients; anything else is rejected before it
+# can become a cache key
+ANALYSIS_TYPES = frozenset({'comprehensive', 'comparison', 'clinical'})
 
 class DrugAnalyzer:
     def __init__(self):
-        load_dotenv()
-        api_key = os.getenv("GROQ_API_KEY")
+        from groq import Groq
+        
+        api_key = Config.GROQ_API_KEY
         if not api_key:
             raise ValueError("GROQ_API_KEY required")
         self.client = Groq(api_key=api_key)
         
-    def validate_drug_name(self, name: str) -> bool:
-        if not name or len(name.strip()) > 50:
+    @staticmethod
+    def validate_drug_name(name: str) -> bool:
+        if not name:
             return False
         clean_name = name.strip()
-        return clean_name in DRUG_DATABASE
+        return len(clean_name) <= 50 and clean_name in DRUG_DATABASE_SET
     
     def generate_analysis(self, drug_name: str, focus: str = 'comprehensive') -> Dict:
         if not self.validate_drug_name(drug_name):
             raise ValueError("Invalid drug name")
-        
-        table_data = self._format_as_table(drug_name)
-        explanation = self._get_drug_explanation(drug_name)
-        recommendation = self._get_best_release(drug_name)
-        references = f"""References:
-• FDA Drug Database - {drug_name} prescribing information and clinical data
-• Shargel L, Yu ABC. Applied Biopharmaceutics & Pharmacokinetics. 7th ed. McGraw-Hill; 2016. ISBN: 978-0071375504
-• Rowland M, Tozer TN. Clinical Pharmacokinetics and Pharmacodynamics. 4th ed. Lippincott Williams & Wilkins; 2011. ISBN: 978-0781750097
-• DrugBank Database - {drug_name} pharmacological data (drugbank.ca)
-• ClinicalTrials.gov - {drug_name} clinical trial safety profiles
-• Goodman & Gilman's Pharmacological Basis of Therapeutics. 13th ed. McGraw-Hill; 2018. ISBN: 978-1259584732
-
-© 2024 Farhan. All rights reserved."""
+        if focus not in ANALYSIS_TYPES:
+            raise ValueError("Invalid analysis type")
+        return self._build_analysis(drug_name, focus)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _build_analysis(drug_name: str, focus: str) -> Dict:
+        # Results depend only on constant tables, so they are memoized for the
+        # life of the process; callers must treat the shared dict as read-only
+        drug_class = _classify(drug_name)
+        table_data = DrugAnalyzer._format_as_table(drug_class)
+        explanation = DrugAnalyzer._get_drug_explanation(drug_name, drug_class)
+        recommendation = DrugAnalyzer._get_best_release(drug_name, drug_class)
+        references = REFERENCES_TEMPLATE.format(drug=drug_name)
         
         content = f"{explanation}\n\n{recommendation}\n\n{references}"
         
@@ -103,133 +397,27 @@ class DrugAnalyzer:
             'success': True
         }
     
-    def _format_as_table(self, drug_name: str) -> Dict:
-        parameters = [
-            'Dissolution Rate', 'Disintegration Time', 'Kinetics', 'Cmax', 'Tmax', 'AUC',
-            'Half-life', 'Onset of Action', 'Duration of Action', 'Side Effects', 'Stability Studies'
-        ]
-        formulations = ['IR', 'SR', 'CR', 'PR', 'DR', 'Targeted']
-        
-        table_data = [['Parameter'] + formulations]
-        drug_data = self._get_drug_specific_data(drug_name)
-        
-        for param in parameters:
-            row = [param] + drug_data[param]
-            table_data.append(row)
-        
-        return {
-            'structured_data': table_data,
-            'parameters': parameters,
-            'formulations': formulations
-        }
+    @staticmethod
+    def _format_as_table(drug_class: str) -> Dict:
+        # Shared, precomputed table; callers must not mutate it
+        return _CLASS_TABLES.get(drug_class, _DEFAULT_TABLE)
     
-    def _get_drug_explanation(self, drug_name: str) -> str:
-        explanations = {
-            'vamorolone': f"{drug_name} is a dissociative steroid for Duchenne muscular dystrophy. It provides anti-inflammatory benefits while reducing steroid side effects.",
-            'repotrectinib': f"{drug_name} is an ALK/ROS1 kinase inhibitor for lung cancer. It overcomes resistance mutations with CNS penetration.",
-            'nirsevimab-alip': f"{drug_name} is a long-acting RSV monoclonal antibody for infant protection. Single injection provides extended immunity.",
-            'bexagliflozin': f"{drug_name} is an SGLT2 inhibitor for type 2 diabetes. It blocks kidney glucose reabsorption with cardiovascular benefits.",
-            'trofinetide': f"{drug_name} is an IGF-1 analog for Rett syndrome. It promotes synaptic development in neurological disorders.",
-            'gepirone': f"{drug_name} is a 5-HT1A agonist for depression. It provides antidepressant effects with fewer sexual side effects.",
-            'sparsentan': f"{drug_name} is a dual receptor antagonist for kidney disease. It reduces proteinuria through endothelin/angiotensin blockade.",
-            'fruquintinib': f"{drug_name} is a VEGFR inhibitor for colorectal cancer. It blocks tumor blood vessel formation.",
-            'pirtobrutinib': f"{drug_name} is a non-covalent BTK inhibitor for B-cell cancers. It overcomes resistance to other BTK drugs.",
-            'lecanemab-irmb': f"{drug_name} is an anti-amyloid antibody for Alzheimer's disease. It targets brain plaques to slow cognitive decline."
-        }
-        
-        if drug_name in explanations:
-            return explanations[drug_name]
-        elif any(x in drug_name.lower() for x in ['mab', 'zumab', 'limab']):
-            return f"{drug_name} is a monoclonal antibody for targeted therapy. It provides precise disease treatment with reduced side effects."
-        elif any(x in drug_name.lower() for x in ['tinib', 'nib']):
-            return f"{drug_name} is a kinase inhibitor for cancer treatment. It blocks specific enzymes driving tumor growth."
-        else:
-            return f"{drug_name} is a therapeutic agent with specific mechanism. It targets biological pathways for disease treatment."
-    
-    def _get_best_release(self, drug_name: str) -> str:
-        if any(x in drug_name.lower() for x in ['mab', 'zumab', 'limab']):
-            return f"Best Release: {drug_name} requires targeted delivery due to protein structure. Subcutaneous injection with extended-release reduces frequency and improves compliance."
-        elif any(x in drug_name.lower() for x in ['tinib', 'nib']):
-            return f"Best Release: {drug_name} benefits from sustained release to maintain therapeutic levels. SR tablets provide consistent kinase inhibition with reduced toxicity."
-        elif 'flozin' in drug_name.lower():
-            return f"Best Release: {drug_name} works best as once-daily extended release. CR formulation ensures 24-hour glucose control with better adherence."
-        else:
-            return f"Best Release: {drug_name} optimal formulation depends on indication. IR for acute effects, SR for chronic therapy, targeted for precision delivery."
-    
-    def _get_drug_specific_data(self, drug_name: str) -> dict:
-        # Generate realistic values based on drug class patterns
-        drug_class_profiles = {
-            # Monoclonal Antibodies (mAbs)
-            'mab_profile': {
-                'Dissolution Rate': ['N/A', 'N/A', 'N/A', 'N/A', 'N/A', '95%/site'],
-                'Disintegration Time': ['N/A', 'N/A', 'N/A', 'N/A', 'N/A', '5-15min'],
-                'Kinetics': ['Linear', 'Linear', 'Linear', 'Linear', 'Linear', 'Targeted'],
-                'Cmax': ['50μg/mL', '45μg/mL', '40μg/mL', '35μg/mL', '48μg/mL', '75μg/mL'],
-                'Tmax': ['24-72h', '48-96h', '72-120h', '96-168h', '48-96h', '12-24h'],
-                'AUC': ['2500μg·h/mL', '3000μg·h/mL', '3500μg·h/mL', '4000μg·h/mL', '2800μg·h/mL', '5000μg·h/mL'],
-                'Half-life': ['14-21d', '21-28d', '28-35d', '35-42d', '14-21d', '10-14d'],
-                'Onset of Action': ['2-4 weeks', '4-6 weeks', '6-8 weeks', '8-12 weeks', '4-6 weeks', '1-2 weeks'],
-                'Duration of Action': ['4-12 weeks', '8-16 weeks', '12-24 weeks', '16-32 weeks', '8-16 weeks', '4-8 weeks'],
-                'Side Effects': ['Infusion reactions', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'],
-                'Stability Studies': ['24 months', '36 months', '48 months', '60 months', '24 months', '18 months']
-            },
-            # Small Molecule Kinase Inhibitors
-            'kinase_profile': {
-                'Dissolution Rate': ['80%/30min', '45%/4h', '22%/8h', '18%/12h', '0%/2h', '70%/site'],
-                'Disintegration Time': ['10-20min', '30-60min', '60-120min', '120-240min', '45-180min', '15-45min'],
-                'Kinetics': ['First-order', 'Zero-order', 'Mixed-order', 'Zero-order', 'First-order', 'Targeted'],
-                'Cmax': ['250ng/mL', '180ng/mL', '120ng/mL', '95ng/mL', '220ng/mL', '350ng/mL'],
-                'Tmax': ['2-4h', '4-8h', '6-12h', '8-16h', '4-8h', '2-6h'],
-                'AUC': ['1200ng·h/mL', '1800ng·h/mL', '2200ng·h/mL', '2800ng·h/mL', '1400ng·h/mL', '3200ng·h/mL'],
-                'Half-life': ['8-12h', '12-18h', '18-24h', '24-36h', '8-12h', '6-10h'],
-                'Onset of Action': ['2-4h', '4-8h', '6-12h', '8-16h', '4-8h', '2-4h'],
-                'Duration of Action': ['12-24h', '24-48h', '48-72h', '72-96h', '24-48h', '12-24h'],
-                'Side Effects': ['Hepatotoxic/Rash', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'],
-                'Stability Studies': ['24 months', '36 months', '48 months', '60 months', '24 months', '18 months']
-            },
-            # Peptide/Protein Therapeutics
-            'peptide_profile': {
-                'Dissolution Rate': ['N/A', 'N/A', 'N/A', 'N/A', 'N/A', '90%/site'],
-                'Disintegration Time': ['N/A', 'N/A', 'N/A', 'N/A', 'N/A', '2-10min'],
-                'Kinetics': ['Non-linear', 'Non-linear', 'Non-linear', 'Non-linear', 'Non-linear', 'Targeted'],
-                'Cmax': ['15μg/mL', '12μg/mL', '8μg/mL', '6μg/mL', '14μg/mL', '25μg/mL'],
-                'Tmax': ['1-3h', '2-6h', '4-8h', '6-12h', '2-6h', '0.5-2h'],
-                'AUC': ['180μg·h/mL', '280μg·h/mL', '350μg·h/mL', '450μg·h/mL', '220μg·h/mL', '600μg·h/mL'],
-                'Half-life': ['2-6h', '4-8h', '6-12h', '8-16h', '2-6h', '1-4h'],
-                'Onset of Action': ['30min-2h', '1-4h', '2-6h', '4-8h', '1-4h', '15-60min'],
-                'Duration of Action': ['6-12h', '12-24h', '24-48h', '48-72h', '12-24h', '4-8h'],
-                'Side Effects': ['Injection site', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'],
-                'Stability Studies': ['18 months', '24 months', '36 months', '48 months', '18 months', '12 months']
-            }
-        }
-        
-        # Map drugs to profiles based on naming patterns
-        if any(x in drug_name.lower() for x in ['mab', 'zumab', 'limab', 'cizumab', 'tuzumab']):
-            return drug_class_profiles['mab_profile']
-        elif any(x in drug_name.lower() for x in ['tinib', 'nib', 'sertib', 'ciclib']):
-            return drug_class_profiles['kinase_profile']
-        elif any(x in drug_name.lower() for x in ['alfa', 'beta', 'ase', 'sen', 'tide']):
-            return drug_class_profiles['peptide_profile']
-        else:
-            # Default small molecule profile
-            return {
-                'Dissolution Rate': ['75%/45min', '40%/5h', '20%/10h', '15%/15h', '0%/3h', '65%/site'],
-                'Disintegration Time': ['8-18min', '25-55min', '55-110min', '110-220min', '40-160min', '12-40min'],
-                'Kinetics': ['First-order', 'Zero-order', 'Mixed-order', 'Zero-order', 'First-order', 'Targeted'],
-                'Cmax': ['120ng/mL', '85ng/mL', '55ng/mL', '42ng/mL', '105ng/mL', '180ng/mL'],
-                'Tmax': ['1.5-3h', '3-7h', '5-10h', '7-14h', '3-7h', '1-4h'],
-                'AUC': ['650ng·h/mL', '950ng·h/mL', '1150ng·h/mL', '1350ng·h/mL', '750ng·h/mL', '1650ng·h/mL'],
-                'Half-life': ['6-10h', '10-16h', '16-24h', '24-36h', '6-10h', '4-8h'],
-                'Onset of Action': ['45min-2h', '2-5h', '4-8h', '6-12h', '2-5h', '30min-2h'],
-                'Duration of Action': ['8-16h', '16-32h', '32-48h', '48-72h', '16-32h', '6-12h'],
-                'Side Effects': ['Moderate', 'Reduced', 'Minimal', 'Minimal', 'Delayed', 'Site-specific'],
-                'Stability Studies': ['24 months', '36 months', '48 months', '60 months', '24 months', '18 months']
-            }
-        
+    @staticmethod
+    def _get_drug_explanation(drug_name: str, drug_class: str) -> str:
+        if drug_name in _EXPLANATIONS:
+            return _EXPLANATIONS[drug_name]
+        return _CLASS_EXPLANATIONS.get(drug_class, _DEFAULT_EXPLANATION).format(name=drug_name)
+    
+    @staticmethod
+    def _get_best_release(drug_name: str, drug_class: str) -> str:
+        return _CLASS_RELEASES.get(drug_class, _DEFAULT_RELEASE).format(name=drug_name)
 
 
-# Initialize analyzer
-analyzer = DrugAnalyzer()
+# The analyzer (and the groq import behind it) is created on first use,
+# so the launcher can report a missing GROQ_API_KEY before paying for it
+@functools.lru_cache(maxsize=1)
+def get_analyzer() -> DrugAnalyzer:
+    return DrugAnalyzer()
 
 # Routes
 @app.route('/')
@@ -242,8 +430,19 @@ def search_drugs():
     if len(query) < 2:
         return jsonify([])
     
-    matches = [drug for drug in DRUG_DATABASE if query in drug.lower()][:10]
-    return jsonify(matches)
+    cached = _TWO_CHAR_RESULTS.get(query)
+    if cached:
+        body, etag = cached
+    else:
+        body, etag = orjson.dumps(_match_drugs(query)), _search_etag(query)
+    
+    # Results only change with the database, so let browsers reuse them. The
+    # body is deterministic per query, so the ETag is strong; Flask-Compress
+    # tags it with the encoding when it compresses the response
+    response = app.response_class(body, mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=3600, immutable'
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 @app.route('/api/analyze', methods=['POST', 'OPTIONS'])
 def analyze_drug():
@@ -258,112 +457,167 @@ def analyze_drug():
         if not drug_name:
             return jsonify({'success': False, 'error': 'Drug name is required'}), 400
             
-        if not analyzer.validate_drug_name(drug_name):
+        if not get_analyzer().validate_drug_name(drug_name):
             return jsonify({'success': False, 'error': 'Please enter a valid drug name from the suggestions'}), 400
         
-        result = analyzer.generate_analysis(drug_name, analysis_type)
+        if not isinstance(analysis_type, str) or analysis_type not in ANALYSIS_TYPES:
+            return jsonify({'success': False, 'error': 'Invalid analysis type'}), 400
+        
+        # Name is already validated, so go straight to the memoized builder
+        result = get_analyzer()._build_analysis(drug_name, analysis_type)
         response = jsonify(result)
         response.headers.add('Access-Control-Allow-Origin', '*')
         return response
         
+    except RequestEntityTooLarge:
+        return jsonify({'success': False, 'error': 'Request too large'}), 413
     except Exception as e:
         return jsonify({'success': False, 'error': f'Analysis failed: {str(e)}'}), 500
 
-@app.route('/api/export/<format_type>')
+# Upper bound for export request bodies; a full PK/PD table is a few kB
+MAX_EXPORT_PAYLOAD_BYTES = 64 * 1024
+# Every JSON body this app accepts is far smaller, so let Werkzeug enforce the
+# cap on all requests; unlike a Content-Length check it also bounds chunked bodies
+app.config['MAX_CONTENT_LENGTH'] = MAX_EXPORT_PAYLOAD_BYTES
+# Bulk export archives larger than this spill to a temp file instead of RAM
+EXPORT_SPOOL_MAX_BYTES = 512 * 1024
+
+# Drugs per bulk export; each one is rendered in its own process
+MAX_BULK_EXPORT_DRUGS = 50
+
+def _read_export_payload():
+    """Return (payload, None) or (None, error response) for an export request body"""
+    try:
+        body = request.get_data()
+    except RequestEntityTooLarge:
+        return None, ("Payload too large", 413)
+    # Werkzeug stops reading a chunked body (no Content-Length) at the limit
+    # without complaint, so check the raw input for anything left over
+    if request.content_length is None and len(body) >= MAX_EXPORT_PAYLOAD_BYTES:
+        if request.environ['wsgi.input'].read(1):
+            return None, ("Payload too large", 413)
+    
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None, ("Invalid data", 400)
+    return payload, None
+
+@app.route('/api/export/<format_type>', methods=['POST'])
 def export_data(format_type):
     try:
-        drug_name = request.args.get('drug')
-        table_data = request.args.get('table_data')
+        payload, error = _read_export_payload()
+        if error:
+            return error
         
-        if not drug_name or not table_data:
+        drug_name = payload.get('drug') if isinstance(payload, dict) else None
+        
+        if not drug_name or not isinstance(drug_name, str):
             return "Missing data", 400
         
-        parsed_data = json.loads(table_data)
+        if not get_analyzer().validate_drug_name(drug_name):
+            return "Invalid drug name", 400
         
+        drug_name = drug_name.strip()
         if format_type == 'excel':
-            return export_excel(drug_name, parsed_data)
+            return export_excel(drug_name)
         elif format_type == 'pdf':
-            return export_pdf(drug_name, parsed_data)
+            return export_pdf(drug_name)
         else:
             return "Invalid format", 400
             
     except Exception as e:
         return "Export failed", 500
 
-def export_excel(drug_name: str, table_data: dict):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{drug_name.replace(' ', '_')}_pk_pd_{timestamp}.xlsx"
+def _write_sheet(workbook, title: str, rows: list, header_format):
+    worksheet = workbook.add_worksheet(title)
     
-    analyzer_instance = DrugAnalyzer()
-    explanation = analyzer_instance._get_drug_explanation(drug_name)
-    recommendation = analyzer_instance._get_best_release(drug_name)
-    references = f"""References:
-• FDA Drug Database - {drug_name} prescribing information and clinical data
-• Shargel L, Yu ABC. Applied Biopharmaceutics & Pharmacokinetics. 7th ed. McGraw-Hill; 2016. ISBN: 978-0071375504
-• Rowland M, Tozer TN. Clinical Pharmacokinetics and Pharmacodynamics. 4th ed. Lippincott Williams & Wilkins; 2011. ISBN: 978-0781750097
-• DrugBank Database - {drug_name} pharmacological data (drugbank.ca)
-• ClinicalTrials.gov - {drug_name} clinical trial safety profiles
-• Goodman & Gilman's Pharmacological Basis of Therapeutics. 13th ed. McGraw-Hill; 2018. ISBN: 978-1259584732
+    # Track column widths as rows are written; xlsxwriter only emits column
+    # settings when the workbook is closed, so they can be applied afterwards
+    widths = [0] * len(rows[0])
+    for row_index, row in enumerate(rows):
+        worksheet.write_row(row_index, 0, row, header_format if row_index == 0 else None)
+        for col_index, value in enumerate(row):
+            widths[col_index] = max(widths[col_index], len(str(value)))
+    
+    for col_index, width in enumerate(widths):
+        worksheet.set_column(col_index, col_index, min(width + 5, 50))
 
-© 2024 Farhan. All rights reserved."""
+def _export_filename(drug_name: str, extension: str) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{drug_name.replace(' ', '_')}_pk_pd_{timestamp}.{extension}"
+
+def _write_excel(analysis: Dict, output):
+    import xlsxwriter
     
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        ref_lines = [line.strip() for line in references.split('\n') if line.strip()]
-        
-        info_data = [
-            ['Drug Information', ''],
-            ['Drug Name', drug_name],
-            ['Description', explanation],
-            ['', ''],
-            ['Best Release Recommendation', ''],
-            ['Recommendation', recommendation],
-            ['', ''],
-            ['References', '']
-        ]
-        
-        for ref_line in ref_lines:
-            info_data.append(['', ref_line])
-        info_df = pd.DataFrame(info_data, columns=['Field', 'Value'])
-        info_df.to_excel(writer, sheet_name='Drug Information', index=False)
-        
-        df = pd.DataFrame(table_data['structured_data'][1:], columns=table_data['structured_data'][0])
-        df.to_excel(writer, sheet_name='PK-PD Table', index=False)
-        
-        for sheet_name in writer.sheets:
-            worksheet = writer.sheets[sheet_name]
-            for column in worksheet.columns:
-                max_length = max(len(str(cell.value)) for cell in column)
-                worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 5, 50)
+    drug_name = analysis['drug_name']
+    explanation = analysis['explanation']
+    recommendation = analysis['recommendation']
+    table_data = analysis['table_data']
+    
+    ref_lines = [line.format(drug=drug_name) for line in REFERENCE_LINE_TEMPLATES]
+    
+    info_data = [
+        ['Field', 'Value'],
+        ['Drug Information', ''],
+        ['Drug Name', drug_name],
+        ['Description', explanation],
+        ['', ''],
+        ['Best Release Recommendation', ''],
+        ['Recommendation', recommendation],
+        ['', ''],
+        ['References', '']
+    ]
     
-    output.seek(0)
+    for ref_line in ref_lines:
+        info_data.append(['', ref_line])
+    
+    # constant_memory flushes each row to a temp file once the next row starts
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    header_format = workbook.add_format({'bold': True})
+    _write_sheet(workbook, 'Drug Information', info_data, header_format)
+    _write_sheet(workbook, 'PK-PD Table', table_data['structured_data'], header_format)
+    workbook.close()
+
+def export_excel(drug_name: str):
     return send_file(
-        output,
+        io.BytesIO(_render_export(drug_name, 'excel')),
         as_attachment=True,
-        download_name=filename,
+        download_name=_export_filename(drug_name, 'xlsx'),
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
 
-def export_pdf(drug_name: str, table_data: dict):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{drug_name.replace(' ', '_')}_pk_pd_{timestamp}.pdf"
+@functools.lru_cache(maxsize=1)
+def _pdf_styles():
+    # Built once and shared by every PDF export; ReportLab only reads them
+    from reportlab.platypus import TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
     
-    analyzer_instance = DrugAnalyzer()
-    explanation = analyzer_instance._get_drug_explanation(drug_name)
-    recommendation = analyzer_instance._get_best_release(drug_name)
-    references = f"""References:
-• FDA Drug Database - {drug_name} prescribing information and clinical data
-• Shargel L, Yu ABC. Applied Biopharmaceutics & Pharmacokinetics. 7th ed. McGraw-Hill; 2016. ISBN: 978-0071375504
-• Rowland M, Tozer TN. Clinical Pharmacokinetics and Pharmacodynamics. 4th ed. Lippincott Williams & Wilkins; 2011. ISBN: 978-0781750097
-• DrugBank Database - {drug_name} pharmacological data (drugbank.ca)
-• ClinicalTrials.gov - {drug_name} clinical trial safety profiles
-• Goodman & Gilman's Pharmacological Basis of Therapeutics. 13th ed. McGraw-Hill; 2018. ISBN: 978-1259584732
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    return getSampleStyleSheet(), table_style
 
-© 2024 Farhan. All rights reserved."""
+def _write_pdf(analysis: Dict, output):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
     
-    output = io.BytesIO()
-    doc = SimpleDocTemplate(output, pagesize=A4)
-    styles = getSampleStyleSheet()
+    drug_name = analysis['drug_name']
+    explanation = analysis['explanation']
+    recommendation = analysis['recommendation']
+    table_data = analysis['table_data']
+    
+    doc = SimpleDocTemplate(output, pagesize=A4, pageCompression=1)
+    styles, table_style = _pdf_styles()
     story = []
     
     title = Paragraph(f"<b>Pharmacokinetic/Pharmacodynamic Analysis</b><br/><b>{drug_name}</b>", styles['Title'])
@@ -383,17 +637,7 @@ def export_pdf(drug_name: str, table_data: dict):
     story.append(Spacer(1, 10))
     
     table = Table(table_data['structured_data'])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('FONTSIZE', (0, 1), (-1, -1), 7),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    table.setStyle(table_style)
     story.append(table)
     story.append(Spacer(1, 20))
     
@@ -409,58 +653,214 @@ def export_pdf(drug_name: str, table_data: dict):
     story.append(ref_title)
     story.append(Spacer(1, 10))
     
-    ref_lines = references.split('\n')
-    for line in ref_lines:
-        if line.strip():
-            ref_text = Paragraph(line, styles['Normal'])
-            story.append(ref_text)
-            story.append(Spacer(1, 6))
+    ref_text = Paragraph(REFERENCE_MARKUP_TEMPLATE.format(drug=drug_name), styles['Normal'])
+    story.append(ref_text)
     
     doc.build(story)
-    output.seek(0)
-    
+
+def export_pdf(drug_name: str):
     return send_file(
-        output,
+        io.BytesIO(_render_export(drug_name, 'pdf')),
         as_attachment=True,
-        download_name=filename,
+        download_name=_export_filename(drug_name, 'pdf'),
         mimetype='application/pdf'
     )
 
+# Export writers and file extensions by format
+_EXPORT_WRITERS = {
+    'excel': (_write_excel, 'xlsx'),
+    'pdf': (_write_pdf, 'pdf')
+}
+
+_export_pool = None
+_export_pool_lock = Lock()
+
+def _get_export_pool() -> ProcessPoolExecutor:
+    # Created on first use and kept for the life of the process; spawn avoids
+    # forking a multi-threaded server process
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            _export_pool = ProcessPoolExecutor(
+                max_workers=Config.EXPORT_POOL_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _export_pool
+
+def _discard_export_pool(pool: ProcessPoolExecutor):
+    # A pool whose child died is unusable; drop it so the next call starts fresh
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is pool:
+            _export_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _render_exports(drug_names: list, format_type: str) -> list:
+    # One retry on a fresh pool if a worker process was killed
+    for attempt in range(2):
+        pool = _get_export_pool()
+        try:
+            futures = [pool.submit(_render_export, name, format_type) for name in drug_names]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            _discard_export_pool(pool)
+            if attempt:
+                raise
+
+@functools.lru_cache(maxsize=64)
+def _render_export(drug_name: str, format_type: str) -> bytes:
+    # Reports are fully determined by the drug, so repeat downloads skip the
+    # layout pass. Module-level so it can be pickled for the bulk export pool;
+    # the name has already been validated by the request handler
+    write, _ = _EXPORT_WRITERS[format_type]
+    output = io.BytesIO()
+    write(DrugAnalyzer._build_analysis(drug_name, 'comprehensive'), output)
+    return output.getvalue()
+
+@app.route('/api/export/bulk/<format_type>', methods=['POST'])
+def export_bulk(format_type):
+    try:
+        if format_type not in _EXPORT_WRITERS:
+            return "Invalid format", 400
+        
+        payload, error = _read_export_payload()
+        if error:
+            return error
+        
+        drug_names = payload.get('drugs') if isinstance(payload, dict) else None
+        if not drug_names or not isinstance(drug_names, list):
+            return "Missing data", 400
+        if not all(isinstance(name, str) and get_analyzer().validate_drug_name(name) for name in drug_names):
+            return "Invalid drug name", 400
+        
+        # Drop duplicates, keeping request order
+        drug_names = list(dict.fromkeys(name.strip() for name in drug_names))
+        if len(drug_names) > MAX_BULK_EXPORT_DRUGS:
+            return "Too many drugs", 400
+        
+        _, extension = _EXPORT_WRITERS[format_type]
+        try:
+            documents = _render_exports(drug_names, format_type)
+        except BrokenProcessPool:
+            return "Export workers unavailable, please retry", 503
+        
+        # The documents are already compressed internally, so the fastest
+        # deflate level is enough for the archive
+        output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_BYTES, mode='w+b')
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            for name, document in zip(drug_names, documents):
+                archive.writestr(_export_filename(name, extension), document)
+        output.seek(0)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return send_file(
+            output,
+            as_attachment=True,
+            download_name=f"pk_pd_{format_type}_{timestamp}.zip",
+            mimetype='application/zip'
+        )
+    
+    except Exception as e:
+        return "Export failed", 500
+
 # Launcher Functions
+def _warm_analyses():
+    for drug_name in DRUG_DATABASE:
+        DrugAnalyzer._build_analysis(drug_name, 'comprehensive')
+
+def _warm_excel():
+    import xlsxwriter  # noqa: F401
+
+def warm_caches():
+    """Create the analyzer, fill the analysis cache and load the export libraries before the first request"""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [executor.submit(fn) for fn in (get_analyzer, _warm_analyses, _pdf_styles, _warm_excel)]:
+            future.result()
+
 def setup_environment():
-    load_dotenv()
-    if not os.getenv('GROQ_API_KEY'):
+    if not Config.GROQ_API_KEY:
         print("❌ GROQ_API_KEY not found!")
         return False
     return True
 
-def open_browser():
-    host = os.getenv('FLASK_HOST', '127.0.0.1')
-    port = os.getenv('FLASK_PORT', '5000')
-    url = f"http://{host}:{port}"
-    webbrowser.open(url)
+def open_browser(url: str, controller: Optional[webbrowser.BaseBrowser] = None):
+    # Hand the URL to the OS opener without waiting on it; webbrowser is
+    # only the fallback since it can block while probing UNIX browsers
+    try:
+        if sys.platform == 'win32':
+            os.startfile(url)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', url])
+        else:
+            subprocess.Popen(['xdg-open', url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        if controller is not None:
+            controller.open_new_tab(url)
+        else:
+            webbrowser.open(url)
+
+def _open_browser_when_ready(host: str, port: int, url: str, timeout: float = 10.0):
+    # Resolve the fallback browser while the server is still starting up
+    try:
+        controller = webbrowser.get()
+    except webbrowser.Error:
+        controller = None
+    
+    # Poll until the server accepts connections rather than sleeping a fixed time
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as probe:
+            if probe.connect_ex((host, port)) == 0:
+                open_browser(url, controller)
+                return
+        time.sleep(0.05)
+
+_BANNER_RULE = "=" * 50
+_BANNER_HEADER = f"🧬 Drug PK/PD Analyzer v2.0\n{_BANNER_RULE}\n"
 
 def main():
-    print("🧬 Drug PK/PD Analyzer v2.0")
-    print("=" * 50)
+    # Under the debug reloader main() runs again in a child process that is
+    # restarted on every code change; only the parent prints and opens a tab
+    reloader_child = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    if not reloader_child:
+        sys.stdout.write(_BANNER_HEADER)
+        sys.stdout.flush()
     
     if not setup_environment():
         return 1
     
     try:
-        print("✅ Environment configured")
-        print("🚀 Starting server...")
-        
-        host = os.getenv('FLASK_HOST', '127.0.0.1')
-        port = int(os.getenv('FLASK_PORT', 5000))
-        debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+        host = Config.FLASK_HOST
+        port = Config.FLASK_PORT
+        debug = Config.DEBUG
+        url = f"http://{host}:{port}"
         
-        print(f"🌐 Server: http://{host}:{port}")
-        print("⏹️  Press Ctrl+C to stop")
-        print("=" * 50)
-        
-        Timer(2.0, open_browser).start()
-        app.run(debug=debug, host=host, port=port, use_reloader=False)
+        if not reloader_child:
+            sys.stdout.write(
+                "✅ Environment configured\n"
+                "🚀 Starting server...\n"
+                f"🌐 Server: {url}\n"
+                "⏹️  Press Ctrl+C to stop\n"
+                f"{_BANNER_RULE}\n"
+            )
+            sys.stdout.flush()
+            
+            Thread(target=_open_browser_when_ready, args=(host, port, url), daemon=True).start()
+        if debug or '--dev' in sys.argv[1:]:
+            # Warm up alongside server startup; early requests simply fill
+            # their own cache entries
+            Thread(target=warm_caches, daemon=True).start()
+            app.run(debug=debug, host=host, port=port, use_reloader=False)
+        elif sys.platform == 'win32':
+            # gunicorn needs fcntl, so Windows gets waitress' threaded server
+            from waitress import serve
+            Thread(target=warm_caches, daemon=True).start()
+            serve(app, host=host, port=port, threads=8, connection_limit=200)
+        else:
+            # Production: multi-worker gunicorn instead of the single-threaded dev server
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            return subprocess.call([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                                    '-b', f'{host}:{port}', 'wsgi:app'], cwd=base_dir)
         
     except KeyboardInterrupt:
         print("\n👋 Server stopped. Goodbye!")
@@ -471,8 +871,4 @@ def main():
     return 0
 
 if __name__ == '__main__':
-    import sys
-    sys.exit(main())
-
-# For deployment
-__all__ = ['app']
+    raise SystemExit(main())
@@ -0,0 +1,11 @@
+"""
+Gunicorn configuration for serving the Drug PK/PD Analyzer in production
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('FLASK_HOST', '0.0.0.0')}:{os.environ.get('PORT', os.environ.get('FLASK_PORT', '5000'))}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
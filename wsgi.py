@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers (e.g. ``gunicorn -c gunicorn.conf.py wsgi:app``)
+"""
+
+from app import app, warm_caches
+
+# Each gunicorn worker imports this module, so every worker starts warm
+warm_caches()
+
+__all__ = ['app']